@@ -3,7 +3,7 @@ import warnings
 
 from fluidfoam.readof import readscalar, readvector, readtensor
 from fluidfoam.readof import readsymmtensor, readfield, readmesh
-from fluidfoam.readof import typefield
+from fluidfoam.readof import typefield, clear_cache
 from fluidfoam.create1dprofile import create1dprofil, read1dprofil
 from fluidfoam.create1dprofile import plot1dprofil
 from fluidfoam._version import __version__
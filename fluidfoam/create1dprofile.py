@@ -53,22 +53,16 @@ def create1dprofil(pathr, pathw, timename, varlist):
 
         if typevar == 'scalar':
             filename1 = pathw+'/1d_profil/'+filename+'.xy'
-            f = open(filename1, "w")
-            f.write('(\n')
-            for cell in range(size1d):
-                f.write('('+str(Y[cell])+' '+str(field[cell])+')\n')
-#            np.savetxt(f, np.c_[Y, field], fmt="(%s %s)")
-            f.write(')\n')
-            f.close()
+            with open(filename1, "wb", buffering=1 << 20) as f:
+                np.savetxt(f, np.column_stack([Y, field]), fmt="(%s %s)",
+                           header='(', footer=')', comments='')
         elif typevar == 'vector':
             for i in range(3):
                 filename1 = pathw+'/1d_profil/'+filename+str(i)+'.xy'
-                f = open(filename1, "w")
-                f.write('(\n')
-                for cell in range(size1d):
-                    f.write('('+str(Y[cell])+' '+str(field[i, cell])+')\n')
-                f.write(')\n')
-                f.close()
+                with open(filename1, "wb", buffering=1 << 20) as f:
+                    np.savetxt(f, np.column_stack([Y, field[i]]),
+                               fmt="(%s %s)", header='(', footer=')',
+                               comments='')
             print('Warning for pyof users : Ua=Ua0, Va=Ua2, Wa=Ua1\n')
         else:
             print('PROBLEM with varlist input: Good input is for example :')
@@ -93,20 +87,11 @@ def read1dprofil(file_name):
         z, a, size1d = fluidfoam.read1dprofil("path_of_case/1d_profil/a.xy")
     """
 
-    with open(file_name) as handle:
-
-        size1d = len(handle.readlines())-2
-        z = np.empty(size1d)
-        field = np.empty(size1d)
-        handle.seek(0)
-        for line_num, line in enumerate(handle):
-            if ((line_num != 0) & (line_num != size1d+1)):
-                line = line.replace(')', '')
-                line = line.replace('(', '')
-                cols = line.split()
-                z[(line_num-1)] = cols[0]
-                field[(line_num-1)] = cols[1]
-        return z, field, size1d
+    # lines are (z field): the closing parenthesis is read as a comment
+    z, field = np.loadtxt(file_name, skiprows=1, comments=')', ndmin=2,
+                          unpack=True,
+                          converters={0: lambda s: float(s[1:])})
+    return z, field, z.size
 
 
 def plot1dprofil(pathr, varlist):
@@ -16,14 +16,53 @@ This module provides functions to read OpenFoam Files:
 
 .. autofunction:: typefield
 
+.. autofunction:: clear_cache
+
 """
 
 
 import os
+import re
+import sys
 import gzip
-import struct
+import mmap
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import numpy as np
 
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+
+_BUFFER_SIZE = 128*1024
+_CACHE_SIZE = 32
+
+# (class suffix, type of field, number of components); SymmTensorField has to
+# be tested before TensorField
+_FIELD_TYPES = ((b'ScalarField', 'scalar', 1),
+                (b'VectorField', 'vector', 3),
+                (b'SymmTensorField', 'symmtensor', 6),
+                (b'TensorField', 'tensor', 9))
+
+# translation table used to parse ASCII lists of vectors, tensors and faces
+_PARENTHESES_TO_SPACES = bytes.maketrans(b'()', b'  ')
+
+# format entry of the header of binary files
+_BINARY_FORMAT = re.compile(b'\\bformat\\s+binary\\s*;')
+
+# bytes separating the numbers of ASCII lists, indexed by byte value
+_SEPARATORS = np.zeros(256, dtype=bool)
+_SEPARATORS[list(b' \t\n\r\x0b\x0c()')] = True
+
+# attributes of the polyMesh files kept in the cache, reused to get the nearest
+# cell values of a patch; faces and points are only needed to compute the
+# centres, which are cached by readmesh
+_MESH_FILE_ARRAYS = {'owner': ('values', 'nb_cell'),
+                     'boundary': ('boundaryface',)}
+
 
 def _make_path(path, time_name=None, name=None):
     if time_name is not None and name is None:  # pragma: no cover
@@ -38,29 +77,151 @@ def _make_path(path, time_name=None, name=None):
     return path
 
 
+def _parse_ascii(data, dtype, nb_numbers, path):
+    """Parse an ASCII list of nb_numbers numbers, parentheses ignored."""
+    values = np.fromstring(data.translate(_PARENTHESES_TO_SPACES),
+                           dtype=dtype, sep=' ')
+    if values.size != nb_numbers:
+        raise ValueError('Expected {} values in {}, found {}.'.format(
+            nb_numbers, path, values.size))
+    return values
+
+
+def _strip_lines(content):
+    return [line.translate(None, b'";').strip()
+            for line in content.splitlines()]
+
+
+class _LRUCache(object):
+    """Mapping keeping only the maxsize most recently used entries."""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key):
+        value = self._data.pop(key, None)
+        if value is not None:
+            self._data[key] = value
+        return value
+
+    def put(self, key, value):
+        self._data.pop(key, None)
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+
+_mesh_files = _LRUCache(_CACHE_SIZE)
+_meshes = _LRUCache(_CACHE_SIZE)
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+
+class _MeshFileArrays(object):
+    """Arrays of a parsed polyMesh file, without the file content."""
+    def __init__(self, meshfile, name):
+        for attr in _MESH_FILE_ARRAYS[name]:
+            setattr(self, attr, getattr(meshfile, attr))
+
+
+def _read_mesh_file(path, name):
+    """Return the parsed polyMesh file; the arrays of the owner and boundary
+    files are reused while they are not modified."""
+    if name not in _MESH_FILE_ARRAYS:
+        return OpenFoamFile(path, name=name)
+    key = _file_key(_make_path(path, name=name)) + (name,)
+    meshfile = _mesh_files.get(key)
+    if meshfile is None:
+        meshfile = _MeshFileArrays(OpenFoamFile(path, name=name), name)
+        _mesh_files.put(key, meshfile)
+    return meshfile
+
+
+class _FaceView(object):
+    """Give access to the faces stored in CSR layout as dictionaries."""
+    def __init__(self, offsets, ids):
+        self._offsets = offsets
+        self._ids = ids
+
+    def __len__(self):
+        return self._offsets.size - 1
+
+    def __getitem__(self, i):
+        start, end = self._offsets[i], self._offsets[i+1]
+        return {'npts': end - start, 'id_pts': self._ids[start:end]}
+
+
 class OpenFoamFile(object):
     """OpenFoam file parser."""
-    def __init__(self, path, time_name=None, name=None, boundary=None):
+    def __init__(self, path, time_name=None, name=None, boundary=None,
+                 dtype=np.float64):
 
         self.pathcase = path
         self.path = _make_path(path, time_name, name)
-        print('Reading file ' + self.path)
+        # single write, the polyMesh files are read by concurrent threads
+        sys.stdout.write('Reading file ' + self.path + '\n')
 
         if not os.path.exists(self.path) and os.path.exists(self.path + '.gz'):
             self.path += '.gz'
 
         self.is_compressed = self.path.endswith('.gz')
-        if self.is_compressed:
-            self._open = gzip.open
+        if self.is_compressed and rapidgzip is not None:
+            with rapidgzip.open(self.path,
+                                parallelization=os.cpu_count()) as f:
+                self.content = f.read()
+        elif self.is_compressed:
+            with open(self.path, 'rb', buffering=_BUFFER_SIZE) as f:
+                with gzip.GzipFile(fileobj=f) as gzf:
+                    self.content = gzf.read()
         else:
-            self._open = open
-
-        with self._open(self.path, 'rb') as f:
-            self.content = f.read()
-
-        self.lines_stripped = [line.strip().replace(
-            b'"', b'').replace(b';', b'')
-            for line in self.content.split(b'\n')]
+            with open(self.path, 'rb') as f:
+                # the header is in the first bytes of the file
+                self.content = f.read(_BUFFER_SIZE)
+                if (len(self.content) == _BUFFER_SIZE and
+                        _BINARY_FORMAT.search(self.content) is not None):
+                    # binary lists are read from the mapped file without
+                    # copy (ASCII data are copied anyway when parsed);
+                    # truncating the file while it is parsed, e.g. by a
+                    # running solver, raises SIGBUS
+                    self.content = mmap.mmap(f.fileno(), 0,
+                                             access=mmap.ACCESS_READ)
+                else:
+                    self.content += f.read()
+
+        try:
+            self._parse(name, boundary, dtype)
+        finally:
+            # the parsed arrays are copies, the file is not needed anymore
+            if isinstance(self.content, mmap.mmap):
+                try:
+                    self.content.close()
+                except BufferError:  # pragma: no cover
+                    # still used by an array of the failed parsing, the map
+                    # is closed when the array is freed
+                    pass
+
+    def _parse(self, name, boundary, dtype):
+
+        # only the dictionaries of the file are split in lines, not the data
+        if name == 'boundary':
+            self.lines_stripped = _strip_lines(self.content[:])
+        elif name in ('faces', 'points', 'owner'):
+            # the header ends with the size of the list, just before it
+            self._list_start = self.content.find(b'\n(')
+            self.lines_stripped = _strip_lines(
+                self.content[:self._list_start])
+        else:
+            self.lines_stripped = _strip_lines(
+                self.content[:self.content.find(b'internalField')])
+            start = self.content.rfind(b'boundaryField')
+            if start != -1:
+                self.lines_stripped += _strip_lines(self.content[start:])
 
         self.header = self._parse_session(b'FoamFile')
 
@@ -70,6 +231,7 @@ class OpenFoamFile(object):
             if line.startswith(b'dimensions'):
                 tmp = b'[' + line.split(b'[')[1]
                 self.dimensions = eval(b', '.join(tmp.split()))
+                break
 
         self.boundary = self._parse_session(b'boundaryField')
 
@@ -82,7 +244,7 @@ class OpenFoamFile(object):
         elif name is 'owner':
             self._parse_owner()
         else:
-            self._parse_data(boundary=boundary)
+            self._parse_data(boundary=boundary, dtype=dtype)
 
     def _parse_boundaryfile(self):
 
@@ -102,7 +264,7 @@ class OpenFoamFile(object):
                 elif line == b'}' or line == b')':
                     level -= 1
                 else:
-                    tmp = line.replace(b'"', b'').split()
+                    tmp = line.split()
                     if len(tmp) == 1:
                         dict_bounfile[tmp[0]] = {}
                     elif len(tmp) > 1:
@@ -131,7 +293,7 @@ class OpenFoamFile(object):
                 elif line == b'}':
                     level -= 1
                 else:
-                    tmp = line.replace(b'"', b'').split()
+                    tmp = line.split()
                     if len(tmp) > 1:
                         if level == 1:
                             dict_session[tmp[0]] = tmp[1]
@@ -145,23 +307,32 @@ class OpenFoamFile(object):
 
         return dict_session
 
-    def _parse_data(self, boundary):
+    def _parse_data(self, boundary, dtype=np.float64):
 
         if boundary is not None:
             boun = str.encode(boundary)
-            if b'value' in self.content.split(boun)[1].split(b'}')[0]:
-                data = self.content.split(boun)[1].split(b'value')[1]
+            start = self.content.rfind(b'boundaryField')
+            if start != -1:
+                start = self.content.find(boun, start)
+            end = self.content.find(b'}', start)
+            if start == -1 or end == -1:
+                raise ValueError('No patch {} in {}.'.format(boundary,
+                                                             self.path))
+            start = self.content.find(b'value', start + len(boun), end)
+            if start != -1:
+                start += len(b'value')
             else:
                 print('Warning : No data on patch')
                 print('Nearest cells values use')
-                self._nearest_data(boundary=boundary)
+                self._nearest_data(boundary=boundary, dtype=dtype)
                 return
         else:
-            data = self.content.split(b'internalField')[1]
+            start = self.content.find(b'internalField') + len(b'internalField')
 
-        lines = data.split(b'\n')
-        shortline = (lines[0].split(b'>')[-1])
-        words = lines[0].split()
+        eol = self.content.find(b'\n', start)
+        firstline = self.content[start:eol]
+        shortline = (firstline.split(b'>')[-1])
+        words = firstline.split()
 
         self.nonuniform = words[0] == b'nonuniform'
         self.uniform = words[0] == b'uniform'
@@ -169,78 +340,62 @@ class OpenFoamFile(object):
 
         self.type_data = self.header[b'class']
 
-        if b'ScalarField' in self.type_data:
-            self.type_data = 'scalar'
-        elif b'VectorField' in self.type_data:
-            self.type_data = 'vector'
-        elif b'SymmTensorField' in self.type_data:
-            self.type_data = 'symmtensor'
-        elif b'TensorField' in self.type_data:
-            self.type_data = 'tensor'
+        for field_class, type_data, nv in _FIELD_TYPES:
+            if field_class in self.type_data:
+                self.type_data, self.nv = type_data, nv
+                break
 
+        offset = 0
         if self.uniform:
             nb_pts = 1
             if not (self.type_data is 'scalar'):
-                data = shortline.split(b'(')[1]
-                data = data.replace(b' ', b'\n')
-                data = data.replace(b');', b'\n);')
+                data = shortline[shortline.find(b'(')+1:shortline.rfind(b')')]
             else:
                 data = words[1].split(b';')[0]
             print("Warning : uniform field  of type " + self.type_data + "!\n")
             print("Only constant field in output\n")
         elif shortline.count(b';') >= 1:
             nb_pts = int(shortline.split(b'(')[0])
-            data = shortline.split(b'(')[1]
-            data = data.replace(b' ', b'\n')
-            data = data.replace(b');', b'\n);')
+            # inline list, the values may be between nested parentheses
+            data = shortline[shortline.find(b'(')+1:shortline.rfind(b')')]
         else:
-            nb_pts = int(lines[1])
-            data = b'\n('.join(data.split(b'\n(')[1:])
+            nb_pts = int(self.content[eol:self.content.find(b'\n', eol + 1)])
+            start = self.content.find(b'\n(', eol) + len(b'\n(')
+            if self.is_ascii:
+                data = self.content[start:self.content.find(b'\n)', start)]
+            else:
+                data, offset = self.content, start
+
+        nb_numbers = self.nv*nb_pts
 
         if not self.is_ascii and not self.uniform:
-            if self.type_data == 'scalar':
-                nb_numbers = nb_pts
-            elif self.type_data == 'vector':
-                nb_numbers = 3*nb_pts
-            elif self.type_data == 'symmtensor':
-                nb_numbers = 6*nb_pts
-            elif self.type_data == 'tensor':
-                nb_numbers = 9*nb_pts
-            self.values = np.array(struct.unpack(
-                '{}d'.format(nb_numbers),
-                data[:nb_numbers*struct.calcsize('d')]))
+            # astype copies, so that the returned values are writable
+            self.values = np.frombuffer(data, dtype='<f8', count=nb_numbers,
+                                        offset=offset).astype(dtype)
         else:
-            if self.type_data == 'scalar':
-                self.values = np.array(
-                    [float(s)
-                     for s in data.strip().split(b'\n')[:nb_pts]])
-            elif self.type_data in ('vector', 'tensor', 'symmtensor'):
-                lines = data.split(b'\n(')
-                lines = [line.split(b')')[0] for line in lines]
-                data = b' '.join(lines).strip()
-                self.values = np.array([float(s) for s in data.split()])
+            self.values = _parse_ascii(data, dtype, nb_numbers, self.path)
 
         if self.type_data == 'vector':
-            self.values_x = self.values[::3]
-            self.values_y = self.values[1::3]
-            self.values_z = self.values[2::3]
+            vectors = self.values.reshape(-1, 3)
+            self.values_x = np.ascontiguousarray(vectors[:, 0])
+            self.values_y = np.ascontiguousarray(vectors[:, 1])
+            self.values_z = np.ascontiguousarray(vectors[:, 2])
 
-    def _nearest_data(self, boundary):
+    def _nearest_data(self, boundary, dtype=np.float64):
 
-        bounfile = OpenFoamFile(self.pathcase + '/constant/polyMesh/',
-                                name='boundary')
-        ownerfile = OpenFoamFile(self.pathcase + '/constant/polyMesh/',
-                                 name='owner')
+        bounfile = _read_mesh_file(self.pathcase + '/constant/polyMesh/',
+                                   'boundary')
+        ownerfile = _read_mesh_file(self.pathcase + '/constant/polyMesh/',
+                                    'owner')
         id0 = int(bounfile.boundaryface[str.encode(boundary)][b'startFace'])
         nfaces = int(bounfile.boundaryface[str.encode(boundary)][b'nFaces'])
-        cell = np.empty(nfaces, dtype=int)
-        for i in range(nfaces):
-            cell[i] = ownerfile.values[id0+i]
-        data = self.content.split(b'internalField')[1]
+        cell = ownerfile.values[id0:id0+nfaces]
+        start = self.content.find(b'internalField') + len(b'internalField')
 
-        lines = data.split(b'\n')
-        shortline = (lines[0].split(b'>')[-1])
-        words = lines[0].split()
+        eol = self.content.find(b'\n', start)
+        firstline = self.content[start:eol]
+        shortline = (firstline.split(b'>')[-1])
+        words = firstline.split()
 
         self.nonuniform = words[0] == b'nonuniform'
         self.uniform = words[0] == b'uniform'
@@ -248,75 +403,49 @@ class OpenFoamFile(object):
 
         self.type_data = self.header[b'class']
 
-        if b'ScalarField' in self.type_data:
-            self.type_data = 'scalar'
-        elif b'VectorField' in self.type_data:
-            self.type_data = 'vector'
-        elif b'SymmTensorField' in self.type_data:
-            self.type_data = 'symmtensor'
-        elif b'TensorField' in self.type_data:
-            self.type_data = 'tensor'
+        for field_class, type_data, nv in _FIELD_TYPES:
+            if field_class in self.type_data:
+                self.type_data, self.nv = type_data, nv
+                break
 
+        offset = 0
         if self.uniform:
             nb_pts = 1
             if not (self.type_data is 'scalar'):
-                data = shortline.split(b'(')[1]
-                data = data.replace(b' ', b'\n')
-                data = data.replace(b');', b'\n);')
+                data = shortline[shortline.find(b'(')+1:shortline.rfind(b')')]
             else:
                 data = words[1].split(b';')[0]
             print("Warning : uniform field  of type " + self.type_data + "!\n")
             print("Only constant field in output\n")
         elif shortline.count(b';') >= 1:
             nb_pts = int(shortline.split(b'(')[0])
-            data = shortline.split(b'(')[1]
-            data = data.replace(b' ', b'\n')
-            data = data.replace(b');', b'\n);')
+            # inline list, the values may be between nested parentheses
+            data = shortline[shortline.find(b'(')+1:shortline.rfind(b')')]
         else:
-            nb_pts = int(lines[1])
-            data = b'\n('.join(data.split(b'\n(')[1:])
+            nb_pts = int(self.content[eol:self.content.find(b'\n', eol + 1)])
+            start = self.content.find(b'\n(', eol) + len(b'\n(')
+            if self.is_ascii:
+                data = self.content[start:self.content.find(b'\n)', start)]
+            else:
+                data, offset = self.content, start
+
+        nb_numbers = self.nv*nb_pts
 
         if not self.is_ascii and not self.uniform:
-            if self.type_data == 'scalar':
-                nb_numbers = nb_pts
-            elif self.type_data == 'vector':
-                nb_numbers = 3*nb_pts
-            elif self.type_data == 'symmtensor':
-                nb_numbers = 6*nb_pts
-            elif self.type_data == 'tensor':
-                nb_numbers = 9*nb_pts
-            values = np.array(struct.unpack(
-                '{}d'.format(nb_numbers),
-                data[:nb_numbers*struct.calcsize('d')]))
+            values = np.frombuffer(data, dtype='<f8', count=nb_numbers,
+                                   offset=offset)
         else:
-            if self.type_data == 'scalar':
-                values = np.array(
-                    [float(s)
-                     for s in data.strip().split(b'\n')[:nb_pts]])
-            elif self.type_data in ('vector', 'tensor', 'symmtensor'):
-                lines = data.split(b'\n(')
-                lines = [line.split(b')')[0] for line in lines]
-                data = b' '.join(lines).strip()
-                values = np.array([float(s) for s in data.split()])
+            values = _parse_ascii(data, dtype, nb_numbers, self.path)
         if self.uniform:
             self.values = values
         else:
-            if self.type_data == 'scalar':
-                nv = 1
-            elif self.type_data == 'vector':
-                nv = 3
-            elif self.type_data == 'symmtensor':
-                nv = 6
-            elif self.type_data == 'tensor':
-                nv = 9
-            valuesbou = np.empty(nv*nfaces, dtype=float)
-            for i in range(nfaces):
-                valuesbou[i*nv:(i+1)*nv] = values[nv*cell[i]:nv*(cell[i]+1)]
-            self.values = valuesbou
+            self.values = values.reshape(-1, self.nv)[cell].ravel().astype(
+                dtype, copy=False)
         if self.type_data == 'vector':
-            self.values_x = self.values[::3]
-            self.values_y = self.values[1::3]
-            self.values_z = self.values[2::3]
+            vectors = self.values.reshape(-1, 3)
+            self.values_x = np.ascontiguousarray(vectors[:, 0])
+            self.values_y = np.ascontiguousarray(vectors[:, 1])
+            self.values_z = np.ascontiguousarray(vectors[:, 2])
 
     def _parse_face(self):
 
@@ -331,41 +460,48 @@ class OpenFoamFile(object):
             self.nfaces = int(line)-1
         else:
             self.nfaces = int(line)
-        data = self.content.split(line)[1]
-        data = b'\n('.join(data.split(b'\n(')[1:])
+        start = self._list_start + len(b'\n(')
 
-        lines = data.split(b'\n')
         self.type_data = self.header[b'class']
-        self.faces = {}
 
         if not self.is_ascii:
             nb_numbers = self.nfaces+1
-            self.pointsbyface = struct.unpack(
-                '{}i'.format(nb_numbers),
-                data[0:nb_numbers*struct.calcsize('i')])
-            data = self.content.split(
-                    str.encode(str(self.pointsbyface[-1])))[1]
-            data = b'\n('.join(data.split(b'\n(')[1:])
-
-            for i in range(self.nfaces):
-                self.faces[i] = {}
-                self.faces[i]['npts'] = (
-                    self.pointsbyface[i+1] - self.pointsbyface[i])
-                self.faces[i]['id_pts'] = np.array(struct.unpack(
-                    '{}i'.format(self.faces[i]['npts']),
-                    data[self.pointsbyface[i]*struct.calcsize('i'):
-                         self.pointsbyface[i+1]*struct.calcsize('i')]))
+            self.face_offsets = np.frombuffer(
+                self.content, dtype='<i4', count=nb_numbers,
+                offset=start).copy()
+            nb_ids = str.encode(str(self.face_offsets[-1]))
+            start = self.content.find(
+                nb_ids, start + self.face_offsets.nbytes)
+            start = self.content.find(b'\n(', start) + len(b'\n(')
+            self.face_ids = np.frombuffer(
+                self.content, dtype='<i4', count=self.face_offsets[-1],
+                offset=start).copy()
         else:
-            for i, line in enumerate(lines):
-                if i == 0:
-                    continue
-                elif line == b')':
-                    break
-                else:
-                    self.faces[i-1] = {}
-                    self.faces[i-1]['npts'] = line.split(b'(')[0]
-                    self.faces[i-1]['id_pts'] = [int(s) for s in ((
-                            line.split(b'(')[1].split(b')')[0]).split())]
+            data = self.content[start:self.content.find(b'\n)', start)]
+            chars = np.frombuffer(data, dtype=np.uint8)
+            opening = np.flatnonzero(chars == ord('('))
+            if opening.size != self.nfaces:
+                raise ValueError('Expected {} faces in {}, found {}.'.format(
+                    self.nfaces, self.path, opening.size))
+            # a number starts after a separator or at the start of the list
+            separators = _SEPARATORS[chars]
+            starts = ~separators
+            starts[1:] &= separators[:-1]
+            number_starts = np.flatnonzero(starts)
+            numbers = _parse_ascii(data, np.int32, number_starts.size,
+                                   self.path)
+            # each face is written as npts(id_0 ... id_npts-1), npts is the
+            # last number before the opening parenthesis of the face
+            npts_index = np.searchsorted(number_starts, opening) - 1
+            self.face_offsets = np.zeros(self.nfaces+1, dtype=np.int32)
+            np.cumsum(numbers[npts_index], out=self.face_offsets[1:])
+            if numbers.size != self.nfaces + self.face_offsets[-1]:
+                raise ValueError('Expected {} values in {}, found {}.'.format(
+                    self.nfaces + self.face_offsets[-1], self.path,
+                    numbers.size))
+            self.face_ids = np.delete(numbers, npts_index)
+
+        self.faces = _FaceView(self.face_offsets, self.face_ids)
 
     def _parse_points(self):
 
@@ -377,24 +513,22 @@ class OpenFoamFile(object):
                 continue
             break
         self.nb_pts = int(line)
-        data = self.content.split(line)[1]
+        start = self._list_start + len(b'\n(')
 
         self.type_data = self.header[b'class']
 
         if not self.is_ascii:
             nb_numbers = 3*self.nb_pts
-            data = b'\n('.join(data.split(b'\n(')[1:])
-            self.values = np.array(struct.unpack(
-                '{}d'.format(nb_numbers),
-                data[:nb_numbers*struct.calcsize('d')]))
+            self.values = np.frombuffer(self.content, dtype='<f8',
+                                        count=nb_numbers, offset=start).copy()
         else:
-            lines = data.split(b'\n(')
-            lines = [line.split(b')')[0] for line in lines]
-            data = b' '.join(lines).strip()
-            self.values = np.array([float(s) for s in data.split()])
-        self.values_x = self.values[::3]
-        self.values_y = self.values[1::3]
-        self.values_z = self.values[2::3]
+            data = self.content[start:self.content.find(b'\n)', start)]
+            self.values = _parse_ascii(data, np.float64, 3*self.nb_pts,
+                                       self.path)
+        points = self.values.reshape(-1, 3)
+        self.values_x = np.ascontiguousarray(points[:, 0])
+        self.values_y = np.ascontiguousarray(points[:, 1])
+        self.values_z = np.ascontiguousarray(points[:, 2])
 
     def _parse_owner(self):
 
@@ -406,24 +540,71 @@ class OpenFoamFile(object):
                 continue
             break
         self.nb_faces = int(line)
-        data = self.content.split(line)[2]
+        start = self._list_start + len(b'\n(')
 
         self.type_data = self.header[b'class']
 
         if not self.is_ascii:
             nb_numbers = self.nb_faces
-            data = b'\n('.join(data.split(b'\n(')[1:])
-            self.values = np.array(struct.unpack(
-                '{}i'.format(nb_numbers),
-                data[:nb_numbers*struct.calcsize('i')]))
+            self.values = np.frombuffer(self.content, dtype='<i4',
+                                        count=nb_numbers, offset=start).copy()
         else:
-            lines = data.split(b'\n(')
-            lines = [line.split(b')')[0] for line in lines]
-            data = b' '.join(lines).strip()
-            self.values = np.array([int(s) for s in data.split()])
+            data = self.content[start:self.content.find(b'\n)', start)]
+            self.values = _parse_ascii(data, np.int32, self.nb_faces,
+                                       self.path)
         self.nb_cell = np.max(self.values) + 1
 
 
+def _mesh_file_names(boundary=None):
+    if boundary is None:
+        return ('faces', 'points', 'owner')
+    return ('faces', 'points', 'boundary')
+
+
+def _mesh_centres(polymesh, boundary=None, dtype=np.float64):
+    """Return the coordinates of the cell centres (or of the face centres of
+    the boundary patch if not None) of the polyMesh directory."""
+
+    names = _mesh_file_names(boundary)
+    # the files are read (and decompressed) concurrently
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        facefile, pointfile, thirdfile = executor.map(
+            partial(_read_mesh_file, polymesh), names)
+    points_x = pointfile.values_x.astype(dtype, copy=False)
+    points_y = pointfile.values_y.astype(dtype, copy=False)
+    points_z = pointfile.values_z.astype(dtype, copy=False)
+
+    if boundary is not None:
+        bounfile = thirdfile
+        id0 = int(bounfile.boundaryface[str.encode(boundary)][b'startFace'])
+        nfaces = int(bounfile.boundaryface[str.encode(boundary)][b'nFaces'])
+
+        offsets = facefile.face_offsets[id0:id0+nfaces+1]
+        id_pts = facefile.face_ids[offsets[0]:offsets[-1]]
+        starts = offsets[:-1] - offsets[0]
+        npts = np.diff(offsets).astype(dtype)
+
+        xs = np.add.reduceat(points_x[id_pts], starts)/npts
+        ys = np.add.reduceat(points_y[id_pts], starts)/npts
+        zs = np.add.reduceat(points_z[id_pts], starts)/npts
+    else:
+        owner = thirdfile
+        # mean over the points of all the faces owned by each cell
+        id_pts = facefile.face_ids
+        starts = facefile.face_offsets[:-1]
+        npts = np.bincount(owner.values, np.diff(facefile.face_offsets))
+
+        # np.bincount always sums in float64
+        xs = (np.bincount(owner.values, np.add.reduceat(
+            points_x[id_pts], starts))/npts).astype(dtype, copy=False)
+        ys = (np.bincount(owner.values, np.add.reduceat(
+            points_y[id_pts], starts))/npts).astype(dtype, copy=False)
+        zs = (np.bincount(owner.values, np.add.reduceat(
+            points_z[id_pts], starts))/npts).astype(dtype, copy=False)
+
+    return xs, ys, zs
+
+
 def typefield(path, time_name=None, name=None):
     """Read OpenFoam field and returns type of field.
 
@@ -448,7 +629,8 @@ def typefield(path, time_name=None, name=None):
     return field.type_data
 
 
-def readfield(path, time_name=None, name=None, shape=None, boundary=None):
+def readfield(path, time_name=None, name=None, shape=None, boundary=None,
+              dtype=np.float64):
     """
     Read OpenFoam field and reshape if necessary and possible (not uniform
     field).
@@ -458,7 +640,8 @@ def readfield(path, time_name=None, name=None, shape=None, boundary=None):
         time_name: str\n
         name: str\n
         shape: None or iterable\n
-        boundary: None or str 
+        boundary: None or str\n
+        dtype: numpy float type of the values (np.float32 halves memory)
 
     Returns:
         array: array of type of the field; size of the array is the size of the
@@ -469,7 +652,7 @@ def readfield(path, time_name=None, name=None, shape=None, boundary=None):
         field = fluidfoam.readfield('path_of_OpenFoam_case', '0', 'alpha')
     """
 
-    field = OpenFoamFile(path, time_name, name, boundary)
+    field = OpenFoamFile(path, time_name, name, boundary, dtype)
     values = field.values
 
     if field.type_data == 'scalar':
@@ -647,14 +830,15 @@ def readtensor(path, time_name=None, name=None, shape=None, boundary=None):
     return values
 
 
-def readmesh(rep, shape=None, boundary=None):
+def readmesh(rep, shape=None, boundary=None, dtype=np.float64):
     """
     Read OpenFoam mesh and reshape if necessary (in cartesian structured mesh).
 
     Args:
         rep: str\n
         shape: None or iterable\n
-        boundary: None or str 
+        boundary: None or str\n
+        dtype: numpy float type of the coordinates (np.float32 halves memory)
 
     Returns:
         array: array of vector (Mesh X, Y, Z); size of the array is the size of
@@ -673,46 +857,35 @@ def readmesh(rep, shape=None, boundary=None):
         raise ValueError('No constant/polyMesh directory in ', rep,
                          ' Please verify the directory of your case.')
 
-    facefile = OpenFoamFile(rep + '/constant/polyMesh/', name='faces')
-    pointfile = OpenFoamFile(rep + '/constant/polyMesh/', name='points')
+    polymesh = rep + '/constant/polyMesh/'
+    key = tuple(_file_key(_make_path(polymesh, name=name))
+                for name in _mesh_file_names(boundary)) + (boundary,
+                                                             np.dtype(dtype))
+    mesh = _meshes.get(key)
+    if mesh is None:
+        mesh = _mesh_centres(polymesh, boundary, dtype)
+        _meshes.put(key, mesh)
+    xs, ys, zs = [coord.copy() for coord in mesh]
+
+    if boundary is None and shape is not None:
+        xs = np.reshape(xs, shape, order="F")
+        ys = np.reshape(ys, shape, order="F")
+        zs = np.reshape(zs, shape, order="F")
 
-    if boundary is not None:
-        bounfile = OpenFoamFile(rep + '/constant/polyMesh/', name='boundary')
-        id0 = int(bounfile.boundaryface[str.encode(boundary)][b'startFace'])
-        nfaces = int(bounfile.boundaryface[str.encode(boundary)][b'nFaces'])
+    return xs, ys, zs
 
-        xs = np.empty(nfaces, dtype=float)
-        ys = np.empty(nfaces, dtype=float)
-        zs = np.empty(nfaces, dtype=float)
-
-        for i in range(nfaces):
-            npts = int(facefile.faces[id0+i]['npts'])
-            id_pts = np.zeros(npts, dtype=int)
-            id_pts[0:npts] = facefile.faces[id0+i]['id_pts'][0:npts]
-            xs[i] = np.mean(pointfile.values_x[id_pts[0:npts]])
-            ys[i] = np.mean(pointfile.values_y[id_pts[0:npts]])
-            zs[i] = np.mean(pointfile.values_z[id_pts[0:npts]])
-    else:
-        owner = OpenFoamFile(rep + '/constant/polyMesh/', name='owner')
-        xs = np.empty(owner.nb_cell, dtype=float)
-        ys = np.empty(owner.nb_cell, dtype=float)
-        zs = np.empty(owner.nb_cell, dtype=float)
-        face = {}
-        for i in range(owner.nb_faces):
-            if not owner.values[i] in face:
-                face[owner.values[i]] = list()
-            face[owner.values[i]].append(facefile.faces[i]['id_pts'][:])
-        for i in range(owner.nb_cell):
-            xs[i] = np.mean(pointfile.values_x[np.concatenate(face[i])[:]])
-            ys[i] = np.mean(pointfile.values_y[np.concatenate(face[i])[:]])
-            zs[i] = np.mean(pointfile.values_z[np.concatenate(face[i])[:]])
-
-        if shape is not None:
-            xs = np.reshape(xs, shape, order="F")
-            ys = np.reshape(ys, shape, order="F")
-            zs = np.reshape(zs, shape, order="F")
 
-    return xs, ys, zs
+def clear_cache():
+    """
+    Clear the polyMesh files and meshes kept in memory by readmesh and
+    readfield.
+
+    A way you might use me is:\n
+        fluidfoam.clear_cache()
+    """
+
+    _mesh_files.clear()
+    _meshes.clear()
 
 
 if __name__ == '__main__':
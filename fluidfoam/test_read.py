@@ -1,6 +1,11 @@
 
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+
 # readof functions
 import fluidfoam
 
@@ -64,6 +69,9 @@ class SimpleTestCase(unittest.TestCase):
         x, y, z = readmesh('output_samples/bin/', boundary = 'bottom')
         x, y, z = readmesh('output_samples/bin/3d/')
         x, y, z = readmesh('output_samples/bin/3d/', boundary = 'bottom')
+        tausinline = readtensor('output_samples/ascii/', '0', 'Tausinline',
+                                boundary='top')
+        self.assertEqual(list(range(1, 10)), list(tausinline.ravel()))
         self.assertEqual(10, alphashort.size)
         self.assertEqual(10, len(alphashort1))
         self.assertEqual(1, len(alphauniform))
@@ -75,3 +83,48 @@ class SimpleTestCase(unittest.TestCase):
         self._test_functions(fluidfoam.readfield, fluidfoam.readfield,
                              fluidfoam.readfield, fluidfoam.readfield,
                              fluidfoam.readmesh, fluidfoam.readfield)
+
+    def test_readmesh_cache(self):
+        for sol in sols:
+            x, y, z = fluidfoam.readmesh(sol)
+            y[:] = 0.
+            xx, yy, zz = fluidfoam.readmesh(sol, (2, size//2))
+            self.assertEqual(size, xx.size)
+            self.assertNotEqual(0., yy.max())
+        fluidfoam.clear_cache()
+        for sol in sols:
+            xx, yy, zz = fluidfoam.readmesh(sol)
+            self.assertNotEqual(0., yy.max())
+
+    def test_readmesh_cache_modified(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            shutil.copytree('output_samples/ascii/constant',
+                            os.path.join(tmp, 'constant'))
+            x, y, z = fluidfoam.readmesh(tmp)
+            points = os.path.join(tmp, 'constant', 'polyMesh', 'points')
+            with open(points, 'rb') as f:
+                content = f.read()
+            mtime = os.stat(points).st_mtime_ns
+            with open(points, 'wb') as f:
+                f.write(content.replace(b'\n(-0.0003 ', b'\n(-0.0009 '))
+            os.utime(points, ns=(mtime + 10**9, mtime + 10**9))
+            xx, yy, zz = fluidfoam.readmesh(tmp)
+            self.assertLess(xx.min(), x.min())
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_read_missing_patch(self):
+        for sol in sols:
+            with self.assertRaises(ValueError):
+                fluidfoam.readscalar(sol, timename, 'alpha', boundary='top')
+
+    def test_read_float32(self):
+        for sol in sols:
+            alpha = fluidfoam.readfield(sol, timename, 'alpha',
+                                        dtype=np.float32)
+            x, y, z = fluidfoam.readmesh(sol, dtype=np.float32)
+            self.assertEqual(np.float32, alpha.dtype)
+            self.assertEqual(np.float32, y.dtype)
+            for i, v in alpha_samples.items():
+                self.assertAlmostEqual(v, alpha[i], places=places)
@@ -19,6 +19,7 @@ setup(
     name="fluidfoam",
     version=__version__,
     packages=find_packages(exclude=['tutorials']),
+    python_requires='>=3.5',
     # Project uses reStructuredText, so ensure that the docutils get
     # installed or upgraded on the target machine
     install_requires=['numpy>=1.11', 'scipy>=0.17',
@@ -46,8 +47,7 @@ setup(
         # ensure that you indicate whether you support Python 2,
         # Python 3 or both.
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.5',
         ])